@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
+import os
+import stat
 from typing import Any, Dict, List, Optional
 
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseDownload, build_http
 from google.oauth2.credentials import Credentials
-import io
+from google_auth_httplib2 import AuthorizedHttp
 
 from .auth import require_auth
-from .markdown import parse_markdown_phased, doc_to_markdown
+from .markdown import parse_markdown_phased, doc_to_markdown, doc_to_text
 
 
 class GoogleDocsClient:
@@ -19,45 +22,82 @@ class GoogleDocsClient:
     def __init__(self, creds: Optional[Credentials] = None):
         """Initialize the client with credentials."""
         self.creds = creds or require_auth()
+        self._http = None
         self._docs_service = None
         self._drive_service = None
 
+    @property
+    def http(self) -> AuthorizedHttp:
+        """Get the authorized HTTP transport shared by the Docs and Drive services."""
+        if self._http is None:
+            self._http = AuthorizedHttp(self.creds, http=build_http())
+        return self._http
+
     @property
     def docs(self):
         """Get Google Docs service."""
         if self._docs_service is None:
-            self._docs_service = build("docs", "v1", credentials=self.creds)
+            self._docs_service = self._build_service("docs", "v1")
         return self._docs_service
 
     @property
     def drive(self):
         """Get Google Drive service."""
         if self._drive_service is None:
-            self._drive_service = build("drive", "v3", credentials=self.creds)
+            self._drive_service = self._build_service("drive", "v3")
         return self._drive_service
 
+    def _build_service(self, name: str, version: str):
+        """Build an API service from the discovery document bundled with the client library."""
+        # build() already uses the bundled discovery JSON when no
+        # discoveryServiceUrl is given; static_discovery=True only pins that
+        # default explicitly
+        return build(
+            name,
+            version,
+            http=self.http,
+            cache_discovery=False,
+            static_discovery=True,
+        )
+
     def list_documents(self, limit: int = 20) -> List[Dict[str, Any]]:
         """List Google Docs documents."""
-        results = (
-            self.drive.files()
-            .list(
-                q="mimeType='application/vnd.google-apps.document'",
-                pageSize=limit,
-                fields="files(id, name, modifiedTime, createdTime)",
-                orderBy="modifiedTime desc",
+        files = []
+        page_token = None
+
+        # Drive caps pageSize at 1000, so page through until we have enough
+        while len(files) < limit:
+            results = (
+                self.drive.files()
+                .list(
+                    q="mimeType='application/vnd.google-apps.document'",
+                    pageSize=min(limit - len(files), MAX_PAGE_SIZE),
+                    pageToken=page_token,
+                    fields="nextPageToken, files(id, name, modifiedTime, createdTime)",
+                    orderBy="modifiedTime desc",
+                )
+                .execute(num_retries=NUM_RETRIES)
             )
-            .execute()
-        )
-        return results.get("files", [])
+            files.extend(results.get("files", []))
+
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                break
+
+        return files[:limit]
 
     def get_document(self, doc_id: str) -> Dict[str, Any]:
         """Get a document by ID."""
-        return self.docs.documents().get(documentId=doc_id).execute()
+        return (
+            self.docs.documents()
+            .get(documentId=doc_id)
+            .execute(num_retries=NUM_RETRIES)
+        )
 
     def get_document_text(self, doc_id: str) -> str:
         """Get plain text content of a document."""
         doc = self.get_document(doc_id)
-        return _extract_text(doc)
+        return doc_to_text(doc)
 
     def create_document(self, title: str, content: Optional[str] = None) -> Dict[str, Any]:
         """Create a new document."""
@@ -72,17 +112,20 @@ class GoogleDocsClient:
 
     def update_title(self, doc_id: str, new_title: str) -> None:
         """Update document title via Drive API."""
-        self.drive.files().update(fileId=doc_id, body={"name": new_title}).execute()
+        (
+            self.drive.files()
+            .update(fileId=doc_id, body={"name": new_title})
+            .execute(num_retries=NUM_RETRIES)
+        )
 
     def append_text(self, doc_id: str, text: str) -> Dict[str, Any]:
         """Append text to the end of a document."""
-        doc = self.get_document(doc_id)
-        end_index = doc["body"]["content"][-1]["endIndex"] - 1
-
+        # endOfSegmentLocation targets the end of the body, so there is no
+        # need to fetch the document to look up its end index first
         requests = [
             {
                 "insertText": {
-                    "location": {"index": end_index},
+                    "endOfSegmentLocation": {},
                     "text": text,
                 }
             }
@@ -113,42 +156,61 @@ class GoogleDocsClient:
 
     def delete_document(self, doc_id: str) -> None:
         """Move document to trash."""
-        self.drive.files().update(fileId=doc_id, body={"trashed": True}).execute()
+        (
+            self.drive.files()
+            .update(fileId=doc_id, body={"trashed": True})
+            .execute(num_retries=NUM_RETRIES)
+        )
 
     def create_from_markdown(self, title: str, markdown_content: str) -> Dict[str, Any]:
-        """Create a new document from Markdown content with formatting."""
+        """
+        Create a new document from Markdown content with formatting.
+
+        Returns the document as created (before the content was inserted).
+        """
         doc = self.docs.documents().create(body={"title": title}).execute()
         doc_id = doc["documentId"]
 
-        # Parse markdown into phases (regular content vs tables)
+        # Parse markdown into phases (regular content vs tables). Content is
+        # sent in one batchUpdate up to and including each table. The parser
+        # predicts how many indices a table takes; rather than trusting that,
+        # the real end index is read back after each table and any difference
+        # is applied to everything that follows it.
         phases = parse_markdown_phased(markdown_content)
-
-        for phase in phases:
+        requests = []
+        offset = 0
+        for position, phase in enumerate(phases):
             if phase["type"] == "requests":
-                # Regular content - just execute the requests
-                if phase["requests"]:
-                    self.docs.documents().batchUpdate(
-                        documentId=doc_id,
-                        body={"requests": phase["requests"]}
-                    ).execute()
-            elif phase["type"] == "table":
-                # Table - need to get current document state first
+                if offset:
+                    _shift_request_indices(phase["requests"], offset)
+                requests.extend(phase["requests"])
+                continue
+
+            requests.extend(self._build_table_requests(
+                phase["headers"],
+                phase["rows"],
+                phase["index"] + offset
+            ))
+            self.docs.documents().batchUpdate(
+                documentId=doc_id,
+                body={"requests": requests}
+            ).execute()
+            requests = []
+
+            if position < len(phases) - 1:
                 current_doc = self.get_document(doc_id)
                 end_index = current_doc["body"]["content"][-1]["endIndex"] - 1
+                offset = end_index - (phase["index"] + phase["length"])
 
-                # Build table requests at current end position
-                table_requests = self._build_table_requests(
-                    phase["headers"],
-                    phase["rows"],
-                    end_index
-                )
-                if table_requests:
-                    self.docs.documents().batchUpdate(
-                        documentId=doc_id,
-                        body={"requests": table_requests}
-                    ).execute()
+        if requests:
+            self.docs.documents().batchUpdate(
+                documentId=doc_id,
+                body={"requests": requests}
+            ).execute()
 
-        return self.get_document(doc_id)
+        # The create response already carries the ID and title callers need,
+        # so skip downloading the freshly filled document again
+        return doc
 
     def _build_table_requests(
         self,
@@ -170,57 +232,63 @@ class GoogleDocsClient:
             }
         })
 
-        # Step 2: Build all cells with their content
-        all_cells = []
-
-        # Header row (row 0)
-        for col, text in enumerate(headers):
-            all_cells.append({"row": 0, "col": col, "text": text, "is_header": True})
-
-        # Data rows (rows 1+)
-        for row_idx, row_data in enumerate(rows):
-            for col in range(num_cols):
-                text = row_data[col] if col < len(row_data) else ""
-                all_cells.append({"row": row_idx + 1, "col": col, "text": text, "is_header": False})
-
-        # Step 3: Insert cell content in REVERSE order to avoid index shifting
+        # Step 2: Insert cell content in REVERSE order to avoid index shifting
         # Cell index formula: start_index + 4 + row * (1 + num_cols * 2) + col * 2
-        for cell in reversed(all_cells):
-            row = cell["row"]
-            col = cell["col"]
-            text = cell["text"]
-            is_header = cell["is_header"]
+        stride = 1 + num_cols * 2
+        for row in range(num_rows - 1, -1, -1):
+            row_data = headers if row == 0 else rows[row - 1]
+            base = start_index + 4 + row * stride
 
-            if not text:
-                continue
-
-            cell_index = start_index + 4 + row * (1 + num_cols * 2) + col * 2
-
-            # Insert text
-            requests.append({
-                "insertText": {
-                    "location": {"index": cell_index},
-                    "text": text
-                }
-            })
+            for col in range(min(num_cols, len(row_data)) - 1, -1, -1):
+                text = row_data[col]
+                if not text:
+                    continue
 
-            # Bold header cells
-            if is_header:
+                cell_index = base + col * 2
                 requests.append({
-                    "updateTextStyle": {
-                        "range": {
-                            "startIndex": cell_index,
-                            "endIndex": cell_index + len(text)
-                        },
-                        "textStyle": {"bold": True},
-                        "fields": "bold"
+                    "insertText": {
+                        "location": {"index": cell_index},
+                        "text": text
                     }
                 })
 
+                # Bold header cells (only their text, so empty cells stay plain)
+                if row == 0:
+                    requests.append({
+                        "updateTextStyle": {
+                            "range": {
+                                "startIndex": cell_index,
+                                "endIndex": cell_index + len(text)
+                            },
+                            "textStyle": {"bold": True},
+                            "fields": "bold"
+                        }
+                    })
+
         return requests
 
-    def export_to_markdown(self, doc_id: str) -> str:
-        """Export a document to Markdown format with formatting preserved."""
+    def export_to_markdown(self, doc_id: str, native: bool = False) -> str:
+        """
+        Export a document to Markdown format with formatting preserved.
+
+        With native=True the conversion runs server-side via Drive's
+        text/markdown export, which skips downloading the full document JSON
+        but produces Google's Markdown dialect rather than the one `import`
+        reads. Falls back to local conversion if Drive refuses the export.
+        """
+        if native:
+            try:
+                data = (
+                    self.drive.files()
+                    .export_media(fileId=doc_id, mimeType="text/markdown")
+                    .execute(num_retries=NUM_RETRIES)
+                )
+                return data.decode("utf-8")
+            except HttpError as e:
+                # 400: conversion not supported, 403: export size limit exceeded
+                if e.resp.status not in (400, 403):
+                    raise
+
         doc = self.get_document(doc_id)
         return doc_to_markdown(doc)
 
@@ -228,30 +296,59 @@ class GoogleDocsClient:
         """Export document to a file."""
         request = self.drive.files().export_media(fileId=doc_id, mimeType=mime_type)
 
-        fh = io.BytesIO()
-        downloader = MediaIoBaseDownload(fh, request)
-
-        done = False
-        while not done:
-            _, done = downloader.next_chunk()
-
-        with open(output_path, "wb") as f:
-            f.write(fh.getvalue())
-
-
-def _extract_text(doc: Dict[str, Any]) -> str:
-    """Extract plain text from a document structure."""
-    text_parts = []
-    content = doc.get("body", {}).get("content", [])
-
-    for element in content:
-        if "paragraph" in element:
-            for para_element in element["paragraph"].get("elements", []):
-                if "textRun" in para_element:
-                    text_parts.append(para_element["textRun"].get("content", ""))
-
-    return "".join(text_parts)
-
+        # Stream chunks into a temporary file next to the output instead of
+        # buffering, and only move it into place once the download finished,
+        # so a failed export never truncates or replaces an existing file.
+        # A symlinked output keeps its link; the file it points to is replaced.
+        target_path = os.path.realpath(output_path)
+        tmp_path = os.path.join(
+            os.path.dirname(target_path),
+            f".gdocs-export-{os.urandom(4).hex()}",
+        )
+        # Created like open() would (0666 minus the umask)
+        fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                downloader = MediaIoBaseDownload(f, request, chunksize=EXPORT_CHUNK_SIZE)
+
+                done = False
+                while not done:
+                    _, done = downloader.next_chunk(num_retries=NUM_RETRIES)
+
+            # Keep the permissions of a file being overwritten
+            if os.path.exists(target_path):
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(target_path).st_mode))
+            os.replace(tmp_path, target_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+def _shift_request_indices(requests: List[Dict[str, Any]], offset: int) -> None:
+    """Move batchUpdate requests by offset indices (in place)."""
+    for request in requests:
+        for body in request.values():
+            if "location" in body:
+                body["location"]["index"] += offset
+            if "range" in body:
+                body["range"]["startIndex"] += offset
+                body["range"]["endIndex"] += offset
+
+
+# Retries for transient errors (429, 5xx) with the client library's
+# exponential backoff. Only used for idempotent calls: a create or
+# batchUpdate that failed after reaching the server may already have been
+# applied, so those are not retried blindly.
+NUM_RETRIES = 5
+
+# Largest page Drive's files.list will return
+MAX_PAGE_SIZE = 1000
+
+# Download chunk size for exports (the client library default is 100KB)
+EXPORT_CHUNK_SIZE = 8 * 1024 * 1024
 
 # Export format mappings
 EXPORT_FORMATS = {
@@ -5,9 +5,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Optional
 
-from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 
 from .config import CLIENT_SECRETS_FILE, SCOPES, TOKEN_FILE, ensure_dirs
 
@@ -27,6 +25,8 @@ def get_credentials() -> Optional[Credentials]:
         creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
 
     if creds and creds.expired and creds.refresh_token:
+        from google.auth.transport.requests import Request
+
         try:
             creds.refresh(Request())
             _save_credentials(creds)
@@ -50,6 +50,8 @@ def login() -> Credentials:
             "4. Download and save as: credentials.json in credentials/"
         )
 
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     flow = InstalledAppFlow.from_client_secrets_file(str(CLIENT_SECRETS_FILE), SCOPES)
 
     try:
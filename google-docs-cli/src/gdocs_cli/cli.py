@@ -3,11 +3,9 @@
 import click
 import sys
 
-from .api import GoogleDocsClient, EXPORT_FORMATS
 from .auth import AuthError, is_authenticated, login, logout
 from .config import get_config_value
 from .formatters import (
-    console,
     format_created_document,
     format_document,
     format_document_content,
@@ -33,6 +31,15 @@ def cli(ctx, output_format):
     ctx.obj["format"] = output_format or get_config_value("output_format") or "table"
 
 
+def _get_client(ctx):
+    """Get the session's GoogleDocsClient, creating it on first use."""
+    if "client" not in ctx.obj:
+        from .api import GoogleDocsClient
+
+        ctx.obj["client"] = GoogleDocsClient()
+    return ctx.obj["client"]
+
+
 # =============================================================================
 # Auth Commands
 # =============================================================================
@@ -87,7 +94,7 @@ def auth_status():
 def list_docs(ctx, limit):
     """List your Google Docs."""
     try:
-        client = GoogleDocsClient()
+        client = _get_client(ctx)
         docs = client.list_documents(limit=limit)
 
         if not docs:
@@ -111,7 +118,7 @@ def list_docs(ctx, limit):
 def get_doc(ctx, doc_id):
     """Get a document by ID."""
     try:
-        client = GoogleDocsClient()
+        client = _get_client(ctx)
         doc = client.get_document(doc_id)
 
         output = format_document(doc, ctx.obj["format"])
@@ -128,10 +135,11 @@ def get_doc(ctx, doc_id):
 @cli.command("create")
 @click.argument("title")
 @click.option("--content", "-c", default=None, help="Initial content for the document")
-def create_doc(title, content):
+@click.pass_context
+def create_doc(ctx, title, content):
     """Create a new Google Doc."""
     try:
-        client = GoogleDocsClient()
+        client = _get_client(ctx)
         doc = client.create_document(title, content)
         format_created_document(doc)
     except AuthError as e:
@@ -145,14 +153,15 @@ def create_doc(title, content):
 @cli.command("update")
 @click.argument("doc_id")
 @click.option("--title", "-t", default=None, help="New title for the document")
-def update_doc(doc_id, title):
+@click.pass_context
+def update_doc(ctx, doc_id, title):
     """Update a document's properties."""
     if not title:
         format_error("No updates specified. Use --title to rename.")
         sys.exit(1)
 
     try:
-        client = GoogleDocsClient()
+        client = _get_client(ctx)
 
         if title:
             client.update_title(doc_id, title)
@@ -168,10 +177,11 @@ def update_doc(doc_id, title):
 @cli.command("append")
 @click.argument("doc_id")
 @click.argument("text")
-def append_text(doc_id, text):
+@click.pass_context
+def append_text(ctx, doc_id, text):
     """Append text to a document."""
     try:
-        client = GoogleDocsClient()
+        client = _get_client(ctx)
         client.append_text(doc_id, text)
         format_success("Text appended successfully.")
     except AuthError as e:
@@ -186,10 +196,11 @@ def append_text(doc_id, text):
 @click.argument("doc_id")
 @click.argument("text")
 @click.option("--index", "-i", default=1, help="Position to insert at (default: 1)")
-def insert_text(doc_id, text, index):
+@click.pass_context
+def insert_text(ctx, doc_id, text, index):
     """Insert text at a specific position."""
     try:
-        client = GoogleDocsClient()
+        client = _get_client(ctx)
         client.insert_text(doc_id, text, index)
         format_success(f"Text inserted at index {index}.")
     except AuthError as e:
@@ -203,10 +214,11 @@ def insert_text(doc_id, text, index):
 @cli.command("delete")
 @click.argument("doc_id")
 @click.option("--force", "-f", is_flag=True, help="Skip confirmation")
-def delete_doc(doc_id, force):
+@click.pass_context
+def delete_doc(ctx, doc_id, force):
     """Delete a document (move to trash)."""
     try:
-        client = GoogleDocsClient()
+        client = _get_client(ctx)
 
         if not force:
             doc = client.get_document(doc_id)
@@ -228,16 +240,24 @@ def delete_doc(doc_id, force):
 @cli.command("export")
 @click.argument("doc_id")
 @click.argument("output_path")
-def export_doc(doc_id, output_path):
+@click.option("--native", is_flag=True, help="Use Google's server-side Markdown conversion (md only)")
+@click.pass_context
+def export_doc(ctx, doc_id, output_path, native):
     """Export a document to a file (supports md for Markdown with formatting)."""
+    from .api import EXPORT_FORMATS
+
     ext = output_path.rsplit(".", 1)[-1].lower() if "." in output_path else ""
 
+    if native and ext != "md":
+        format_error("--native is only supported for Markdown (.md) exports.")
+        sys.exit(1)
+
     try:
-        client = GoogleDocsClient()
+        client = _get_client(ctx)
 
         # Handle Markdown export specially (with formatting)
         if ext == "md":
-            markdown_content = client.export_to_markdown(doc_id)
+            markdown_content = client.export_to_markdown(doc_id, native=native)
             with open(output_path, "w", encoding="utf-8") as f:
                 f.write(markdown_content)
             format_success(f"Exported to: {output_path}")
@@ -262,7 +282,8 @@ def export_doc(doc_id, output_path):
 @cli.command("import")
 @click.argument("file_path", type=click.Path(exists=True))
 @click.option("--title", "-t", default=None, help="Document title (defaults to filename)")
-def import_doc(file_path, title):
+@click.pass_context
+def import_doc(ctx, file_path, title):
     """Import a Markdown file as a new Google Doc with formatting."""
     import os
 
@@ -280,7 +301,7 @@ def import_doc(file_path, title):
         if not title:
             title = os.path.basename(file_path).rsplit(".", 1)[0]
 
-        client = GoogleDocsClient()
+        client = _get_client(ctx)
         doc = client.create_from_markdown(title, content)
         format_created_document(doc)
     except AuthError as e:
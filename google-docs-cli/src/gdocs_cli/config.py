@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Union
 
+from . import jsonutil
+
 # Base paths
 APP_DIR = Path.home() / ".claude" / "google-docs-cli"
 CREDENTIALS_DIR = APP_DIR / "credentials"
@@ -34,24 +36,30 @@ def ensure_dirs() -> None:
 
 def load_config() -> dict:
     """Load configuration from file."""
-    ensure_dirs()
     if CONFIG_FILE.exists():
         with open(CONFIG_FILE, "r") as f:
-            return {**DEFAULT_CONFIG, **json.load(f)}
+            return {**DEFAULT_CONFIG, **jsonutil.loads(f.read())}
+    ensure_dirs()
     return DEFAULT_CONFIG.copy()
 
 
+@lru_cache(maxsize=1)
+def _load_config_cached() -> dict:
+    """Load configuration once per process (do not mutate the result)."""
+    return load_config()
+
+
 def save_config(config: dict) -> None:
     """Save configuration to file."""
     ensure_dirs()
     with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=2)
+        f.write(jsonutil.dumps(config))
+    _load_config_cached.cache_clear()
 
 
 def get_config_value(key: str) -> Optional[Union[str, int]]:
     """Get a specific configuration value."""
-    config = load_config()
-    return config.get(key)
+    return _load_config_cached().get(key)
 
 
 def set_config_value(key: str, value: Union[str, int]) -> None:
@@ -2,22 +2,34 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
+from . import jsonutil
+from .markdown import HEADING_PREFIX, doc_to_text
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Rich is only imported once something is actually printed through it, so
+# json/plain output never pays for it
+_console: Optional[Console] = None
+
+
+def get_console() -> Console:
+    """Get the shared Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
 
 
 def format_document_list(docs: List[Dict[str, Any]], output_format: str = "table") -> str:
     """Format a list of documents."""
     if output_format == "json":
-        return json.dumps(docs, indent=2, default=str)
+        return jsonutil.dumps(docs)
 
     if output_format == "plain":
         lines = []
@@ -26,6 +38,8 @@ def format_document_list(docs: List[Dict[str, Any]], output_format: str = "table
         return "\n".join(lines)
 
     # Table format (default)
+    from rich.table import Table
+
     table = Table(title="Google Docs")
     table.add_column("ID", style="dim")
     table.add_column("Name", style="bold")
@@ -35,25 +49,27 @@ def format_document_list(docs: List[Dict[str, Any]], output_format: str = "table
         modified = _format_date(doc.get("modifiedTime", ""))
         table.add_row(doc["id"], doc["name"], modified)
 
-    console.print(table)
+    get_console().print(table)
     return ""
 
 
 def format_document(doc: Dict[str, Any], output_format: str = "table") -> str:
     """Format a single document."""
     if output_format == "json":
-        return json.dumps(doc, indent=2, default=str)
+        return jsonutil.dumps(doc)
 
     if output_format == "plain":
-        text = _extract_text_from_doc(doc)
+        text = doc_to_text(doc)
         return f"Title: {doc.get('title', 'Untitled')}\n\n{text}"
 
     # Table format (rich panel)
+    from rich.panel import Panel
+
     title = doc.get("title", "Untitled")
     doc_id = doc.get("documentId", "Unknown")
-    text = _extract_text_from_doc(doc)
+    text = doc_to_text(doc)
 
-    console.print(Panel(
+    get_console().print(Panel(
         text.strip() or "[dim]Empty document[/dim]",
         title=f"[bold]{title}[/bold]",
         subtitle=f"[dim]{doc_id}[/dim]",
@@ -64,9 +80,9 @@ def format_document(doc: Dict[str, Any], output_format: str = "table") -> str:
 def format_document_content(doc: Dict[str, Any], output_format: str = "table") -> str:
     """Format document content (text only)."""
     if output_format == "json":
-        return json.dumps(doc, indent=2, default=str)
+        return jsonutil.dumps(doc)
 
-    text = _extract_text_from_doc(doc)
+    text = doc_to_text(doc)
 
     if output_format == "plain":
         return text
@@ -80,17 +96,17 @@ def format_document_content(doc: Dict[str, Any], output_format: str = "table") -
 
 def format_success(message: str) -> None:
     """Print a success message."""
-    console.print(f"[green]✓[/green] {message}")
+    get_console().print(f"[green]✓[/green] {message}")
 
 
 def format_error(message: str) -> None:
     """Print an error message."""
-    console.print(f"[red]✗[/red] {message}")
+    get_console().print(f"[red]✗[/red] {message}")
 
 
 def format_info(message: str) -> None:
     """Print an info message."""
-    console.print(f"[blue]ℹ[/blue] {message}")
+    get_console().print(f"[blue]ℹ[/blue] {message}")
 
 
 def format_created_document(doc: Dict[str, Any]) -> None:
@@ -99,15 +115,19 @@ def format_created_document(doc: Dict[str, Any]) -> None:
     title = doc.get("title", "Untitled")
     url = f"https://docs.google.com/document/d/{doc_id}/edit"
 
-    console.print(f"[green]✓[/green] Created document: [bold]{title}[/bold]")
-    console.print(f"  ID:  {doc_id}")
-    console.print(f"  URL: [link={url}]{url}[/link]")
+    get_console().print(f"[green]✓[/green] Created document: [bold]{title}[/bold]")
+    get_console().print(f"  ID:  {doc_id}")
+    get_console().print(f"  URL: [link={url}]{url}[/link]")
 
 
 def _format_date(date_str: str) -> str:
     """Format an ISO date string to human-readable format."""
     if not date_str:
         return ""
+    # Drive returns RFC 3339 timestamps (2024-01-15T10:30:00.000Z); the output
+    # is just their date and HH:MM, so slice instead of parsing
+    if len(date_str) >= 16 and date_str[4] == "-" and date_str[10] == "T" and date_str[13] == ":":
+        return f"{date_str[:10]} {date_str[11:16]}"
     try:
         dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
         return dt.strftime("%Y-%m-%d %H:%M")
@@ -115,24 +135,10 @@ def _format_date(date_str: str) -> str:
         return date_str
 
 
-def _extract_text_from_doc(doc: Dict[str, Any]) -> str:
-    """Extract plain text from document body."""
-    text_parts = []
-    content = doc.get("body", {}).get("content", [])
-
-    for element in content:
-        if "paragraph" in element:
-            for para_element in element["paragraph"].get("elements", []):
-                if "textRun" in para_element:
-                    text_parts.append(para_element["textRun"].get("content", ""))
-
-    return "".join(text_parts)
-
-
 def _convert_to_markdown(doc: Dict[str, Any]) -> str:
     """Convert document to basic Markdown."""
     lines = []
-    content = doc.get("body", {}).get("content", [])
+    content = doc.get("body", {}).get("content") or ()
 
     for element in content:
         if "paragraph" not in element:
@@ -141,33 +147,29 @@ def _convert_to_markdown(doc: Dict[str, Any]) -> str:
         paragraph = element["paragraph"]
         style = paragraph.get("paragraphStyle", {}).get("namedStyleType", "NORMAL_TEXT")
 
-        para_text = ""
-        for para_element in paragraph.get("elements", []):
+        run_parts: List[str] = []
+        for para_element in paragraph.get("elements") or ():
             if "textRun" in para_element:
-                text = para_element["textRun"].get("content", "")
-                text_style = para_element["textRun"].get("textStyle", {})
-
-                if text_style.get("bold"):
-                    text = f"**{text.strip()}**"
-                if text_style.get("italic"):
-                    text = f"*{text.strip()}*"
-
-                para_text += text
+                text_run = para_element["textRun"]
+                run_parts.append(_format_run(text_run.get("content", ""), text_run.get("textStyle", {})))
+        para_text = "".join(run_parts)
 
         # Apply heading styles
-        if style == "HEADING_1":
-            para_text = f"# {para_text.strip()}"
-        elif style == "HEADING_2":
-            para_text = f"## {para_text.strip()}"
-        elif style == "HEADING_3":
-            para_text = f"### {para_text.strip()}"
-        elif style == "HEADING_4":
-            para_text = f"#### {para_text.strip()}"
-        elif style == "HEADING_5":
-            para_text = f"##### {para_text.strip()}"
-        elif style == "HEADING_6":
-            para_text = f"###### {para_text.strip()}"
+        prefix = HEADING_PREFIX.get(style)
+        if prefix:
+            para_text = prefix + para_text.strip()
+        else:
+            para_text = para_text.rstrip("\n")
 
         lines.append(para_text)
 
-    return "".join(lines)
+    return "\n".join(lines)
+
+
+def _format_run(text: str, text_style: Dict[str, Any]) -> str:
+    """Wrap a text run in bold/italic markers."""
+    if text_style.get("bold"):
+        text = f"**{text.strip()}**"
+    if text_style.get("italic"):
+        text = f"*{text.strip()}*"
+    return text
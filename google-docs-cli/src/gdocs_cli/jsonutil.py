@@ -0,0 +1,29 @@
+"""JSON helpers that use orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # Optional speedup: pip install "gdocs-cli[fast]"
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to indented JSON, falling back to str() for unsupported values."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        ).decode("utf-8")
+    return json.dumps(obj, indent=2, default=str, ensure_ascii=False)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -3,8 +3,150 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
+from functools import lru_cache
+from io import StringIO
 from typing import Any, Dict, List, Optional, Tuple
 
+# Colors shared by every request that uses them (they are never mutated)
+_GREY_40 = {"red": 0.4, "green": 0.4, "blue": 0.4}  # blockquote text
+_GREY_60 = {"red": 0.6, "green": 0.6, "blue": 0.6}  # completed tasks
+_GREY_70 = {"red": 0.7, "green": 0.7, "blue": 0.7}  # horizontal rules
+_GREY_80 = {"red": 0.8, "green": 0.8, "blue": 0.8}  # blockquote border
+_GREY_95 = {"red": 0.95, "green": 0.95, "blue": 0.95}  # code background
+_YELLOW = {"red": 1.0, "green": 1.0, "blue": 0.0}  # highlight
+
+# Paragraph styles that are the same for every blockquote / code block.
+# Requests share these dicts, so they must never be mutated.
+_BLOCKQUOTE_PARAGRAPH_STYLE = {
+    "indentStart": {"magnitude": 36, "unit": "PT"},
+    "indentFirstLine": {"magnitude": 36, "unit": "PT"},
+    "borderLeft": {
+        "color": {"color": {"rgbColor": _GREY_80}},
+        "width": {"magnitude": 3, "unit": "PT"},
+        "padding": {"magnitude": 12, "unit": "PT"},
+        "dashStyle": "SOLID"
+    }
+}
+_BLOCKQUOTE_PARAGRAPH_FIELDS = "indentStart,indentFirstLine,borderLeft"
+
+_CODE_BLOCK_PARAGRAPH_STYLE = {
+    "shading": {
+        "backgroundColor": {
+            "color": {
+                "rgbColor": _GREY_95
+            }
+        }
+    },
+    "indentStart": {"magnitude": 18, "unit": "PT"},
+    "indentEnd": {"magnitude": 18, "unit": "PT"},
+    "spaceAbove": {"magnitude": 6, "unit": "PT"},
+    "spaceBelow": {"magnitude": 6, "unit": "PT"}
+}
+_CODE_BLOCK_PARAGRAPH_FIELDS = "shading,indentStart,indentEnd,spaceAbove,spaceBelow"
+
+# createParagraphBullets presets. Nesting comes from leading tabs in the
+# bulleted text, not from the request, so the builders take no level.
+_BULLET_PRESET_DISC = "BULLET_DISC_CIRCLE_SQUARE"
+_BULLET_PRESET_NUMBERED = "NUMBERED_DECIMAL_NESTED"
+
+# updateTextStyle options: keyword name -> (TextStyle field, value wrapper)
+_TEXT_STYLE_FIELDS = {
+    "bold": ("bold", None),
+    "italic": ("italic", None),
+    "underline": ("underline", None),
+    "strikethrough": ("strikethrough", None),
+    "font_family": ("weightedFontFamily", lambda v: {"fontFamily": v}),
+    "font_size": ("fontSize", lambda v: {"magnitude": v, "unit": "PT"}),
+    "link_url": ("link", lambda v: {"url": v}),
+    "foreground_color": ("foregroundColor", lambda v: {"color": {"rgbColor": v}}),
+    "background_color": ("backgroundColor", lambda v: {"color": {"rgbColor": v}}),
+    "baseline_offset": ("baselineOffset", None),
+    "small_caps": ("smallCaps", None),
+}
+
+# Block-level patterns (matched against whole lines)
+_RE_HR = re.compile(r'^(-{3,}|\*{3,}|_{3,})$')
+
+# Headings, blockquotes and lists in one pass. Alternatives are tried in
+# order (task lists must win over bullets), and each is wrapped in a named
+# group so match.lastgroup says which one matched.
+_RE_BLOCK = re.compile(
+    r'^(?:'
+    r'(?P<heading>(?P<heading_level>#{1,6})\s+(?P<heading_text>.+))'
+    r'|(?P<blockquote>>\s*(?P<quote_text>.*))'
+    r'|(?P<task>[-\*]\s+\[(?P<task_state>[ xX])\]\s+(?P<task_text>.+))'
+    r'|(?P<bullet>[\s]*[-\*]\s+(?P<bullet_text>.+))'
+    r'|(?P<numbered>[\s]*\d+\.\s+(?P<numbered_text>.+))'
+    r')$'
+)
+
+# Markdown prefix for each heading paragraph style (shared with formatters)
+HEADING_PREFIX = {
+    "HEADING_1": "# ",
+    "HEADING_2": "## ",
+    "HEADING_3": "### ",
+    "HEADING_4": "#### ",
+    "HEADING_5": "##### ",
+    "HEADING_6": "###### ",
+}
+
+# Common monospace fonts, checked by exact name before the substring test
+# (any font with "courier" or "mono" in its name)
+_MONO_EXACT = frozenset((
+    "Courier New",
+    "Roboto Mono",
+    "Consolas",
+    "Source Code Pro",
+    "Fira Code",
+    "JetBrains Mono",
+))
+
+_MONO_RE = re.compile(r'courier|mono', re.IGNORECASE)
+
+# Checkbox prefixes written for task list items and recognized on export
+_TASK_DONE = "☑ "
+_TASK_TODO = "☐ "
+
+# List glyph types exported as numbered (rather than bullet) items
+_NUMBERED_GLYPHS = frozenset(("DECIMAL", "ALPHA", "ROMAN"))
+
+# Characters that make up a horizontal rule paragraph in an exported doc
+_HR_CHARS = "─-—"
+
+# Characters allowed in a table separator row besides whitespace (|---|:-:|)
+_TABLE_SEP_DELETE = str.maketrans("", "", "-:|")
+
+# Inline formatting, scanned left to right with finditer. At each position
+# the alternatives are tried in order, so where two could match the earlier
+# one wins (e.g. ***x*** is bold+italic, not bold around *x*).
+_RE_INLINE = re.compile(
+    r'(?P<link>\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)]+)\))'
+    r'|(?P<strike>~~(?P<strike_text>.+?)~~)'
+    r'|(?P<highlight>==(?P<highlight_text>.+?)==)'
+    r'|(?P<underline>\+\+(?P<underline_text>.+?)\+\+)'
+    r'|(?P<superscript>\^(?P<superscript_text>[^\^]+)\^)'
+    r'|(?P<subscript>~(?P<subscript_text>[^~]+)~(?!~))'
+    r'|(?P<bold_italic>\*\*\*(?P<bold_italic_text>.+?)\*\*\*)'
+    r'|(?P<bold>(?P<bold_mark>\*\*|__)(?P<bold_text>.+?)(?P=bold_mark))'
+    r'|(?P<italic>(?P<italic_mark>[*_])(?P<italic_text>[^*_]+)(?P=italic_mark))'
+    r'|(?P<code>`(?P<code_text>[^`]+)`)'
+)
+
+# Text style for each _RE_INLINE alternative except links, whose URL
+# comes from the match
+_INLINE_STYLES = {
+    'strike': {'strikethrough': True},
+    'highlight': {'background_color': _YELLOW},
+    'underline': {'underline': True},
+    'superscript': {'baseline_offset': "SUPERSCRIPT"},
+    'subscript': {'baseline_offset': "SUBSCRIPT"},
+    'bold_italic': {'bold': True, 'italic': True},
+    'bold': {'bold': True},
+    'italic': {'italic': True},
+    'code': {'font_family': "Courier New", 'background_color': _GREY_95},
+}
+
 
 def parse_markdown_phased(content: str) -> List[Dict[str, Any]]:
     """
@@ -14,205 +156,44 @@ def parse_markdown_phased(content: str) -> List[Dict[str, Any]]:
     - {"type": "requests", "requests": [...]} for regular content
     - {"type": "table", "headers": [...], "rows": [[...], ...]} for tables
 
-    Tables are separated into their own phases because they need to be
-    inserted with knowledge of the current document state.
+    Tables are separated into their own phases because they are inserted as
+    native Google Docs tables. Each table phase also carries the "index" it
+    starts at and its predicted "length"; indices keep running past the
+    table using that prediction.
     """
-    phases = []
-    current_requests = []
-    current_index = 1  # Google Docs starts at index 1
-
-    lines = content.split('\n')
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-
-        # Check for code blocks
-        if line.startswith('```'):
-            code_lines = []
-            i += 1
-            while i < len(lines) and not lines[i].startswith('```'):
-                code_lines.append(lines[i])
-                i += 1
-            code_text = '\n'.join(code_lines) + '\n'
-            if code_text.strip():
-                current_requests.append(_insert_text_request(current_index, code_text))
-                end_index = current_index + len(code_text)
-                current_requests.append(_update_text_style_request(
-                    current_index, end_index,
-                    font_family="Courier New"
-                ))
-                current_requests.append(_update_paragraph_style_request_code_block(
-                    current_index, end_index
-                ))
-                current_index = end_index
-            i += 1
-            continue
-
-        # Check for horizontal rules
-        if re.match(r'^(-{3,}|\*{3,}|_{3,})$', line.strip()):
-            hr_text = "─" * 50 + '\n'
-            current_requests.append(_insert_text_request(current_index, hr_text))
-            end_index = current_index + len(hr_text) - 1
-            current_requests.append(_update_text_style_request(
-                current_index, end_index,
-                foreground_color={"red": 0.7, "green": 0.7, "blue": 0.7}
-            ))
-            current_requests.append(_update_paragraph_style_request_alignment(
-                current_index, end_index + 1, "CENTER"
-            ))
-            current_index += len(hr_text)
-            i += 1
-            continue
-
-        # Check for tables (start of table)
-        if '|' in line and re.match(r'^\|.*\|$', line.strip()):
-            # Save current requests as a phase before the table
-            if current_requests:
-                phases.append({"type": "requests", "requests": current_requests})
-                current_requests = []
-
-            # Parse table
-            table_lines = [line]
-            i += 1
-            while i < len(lines) and '|' in lines[i] and re.match(r'^\|.*\|$', lines[i].strip()):
-                table_lines.append(lines[i])
-                i += 1
-
-            headers, rows = _parse_table_data(table_lines)
-            phases.append({"type": "table", "headers": headers, "rows": rows})
-
-            # Reset index to 1 - next phase will start fresh after querying doc
-            current_index = 1
-            continue
-
-        # Check for headings
-        heading_match = re.match(r'^(#{1,6})\s+(.+)$', line)
-        if heading_match:
-            level = len(heading_match.group(1))
-            heading_content = heading_match.group(2)
-            text, style_requests = _parse_inline_formatting(heading_content + '\n', current_index)
-            current_requests.append(_insert_text_request(current_index, text))
-            end_index = current_index + len(text)
-            current_requests.append(_update_paragraph_style_request(
-                current_index, end_index,
-                f"HEADING_{level}"
-            ))
-            for req in style_requests:
-                current_requests.append(req)
-            current_index = end_index
-            i += 1
-            continue
-
-        # Check for blockquotes
-        blockquote_match = re.match(r'^>\s*(.*)$', line)
-        if blockquote_match:
-            quote_text = blockquote_match.group(1)
-            text, style_requests = _parse_inline_formatting(quote_text + '\n', current_index)
-            current_requests.append(_insert_text_request(current_index, text))
-            end_index = current_index + len(text)
-            current_requests.append(_update_paragraph_style_request_blockquote(
-                current_index, end_index
-            ))
-            current_requests.append(_update_text_style_request(
-                current_index, end_index - 1,
-                italic=True,
-                foreground_color={"red": 0.4, "green": 0.4, "blue": 0.4}
-            ))
-            current_requests.extend(style_requests)
-            current_index = end_index
-            i += 1
-            continue
-
-        # Check for task lists
-        task_match = re.match(r'^[-\*]\s+\[([ xX])\]\s+(.+)$', line)
-        if task_match:
-            is_checked = task_match.group(1).lower() == 'x'
-            task_text = task_match.group(2)
-            checkbox = "☑ " if is_checked else "☐ "
-            full_text = checkbox + task_text + '\n'
-            text, style_requests = _parse_inline_formatting(full_text, current_index)
-            current_requests.append(_insert_text_request(current_index, text))
-            end_index = current_index + len(text)
-            current_requests.append(_create_bullet_request(current_index, end_index))
-            if is_checked:
-                current_requests.append(_update_text_style_request(
-                    current_index + 2, end_index - 1,
-                    strikethrough=True,
-                    foreground_color={"red": 0.6, "green": 0.6, "blue": 0.6}
-                ))
-            current_requests.extend(style_requests)
-            current_index = end_index
-            i += 1
-            continue
+    return _parse_blocks(content, native_tables=True)
 
-        # Check for bullet lists
-        bullet_match = re.match(r'^([\s]*)[-\*]\s+(.+)$', line)
-        if bullet_match:
-            indent_str = bullet_match.group(1)
-            nesting_level = len(indent_str) // 2
-            list_text = bullet_match.group(2)
-            text, style_requests = _parse_inline_formatting(list_text + '\n', current_index)
-            current_requests.append(_insert_text_request(current_index, text))
-            end_index = current_index + len(text)
-            current_requests.append(_create_bullet_request(current_index, end_index, nesting_level))
-            current_requests.extend(style_requests)
-            current_index = end_index
-            i += 1
-            continue
 
-        # Check for numbered lists
-        numbered_match = re.match(r'^([\s]*)\d+\.\s+(.+)$', line)
-        if numbered_match:
-            indent_str = numbered_match.group(1)
-            nesting_level = len(indent_str) // 2
-            list_text = numbered_match.group(2)
-            text, style_requests = _parse_inline_formatting(list_text + '\n', current_index)
-            current_requests.append(_insert_text_request(current_index, text))
-            end_index = current_index + len(text)
-            current_requests.append(_create_numbered_list_request(current_index, end_index, nesting_level))
-            current_requests.extend(style_requests)
-            current_index = end_index
-            i += 1
-            continue
-
-        # Regular paragraph with inline formatting
-        if line.strip():
-            text, style_requests = _parse_inline_formatting(line + '\n', current_index)
-            current_requests.append(_insert_text_request(current_index, text))
-            current_requests.extend(style_requests)
-            current_index += len(text)
-        elif i < len(lines) - 1:
-            current_requests.append(_insert_text_request(current_index, '\n'))
-            current_index += 1
-
-        i += 1
+def _is_table_row(stripped: str) -> bool:
+    """Check whether a stripped line is a table row (starts and ends with a pipe)."""
+    return len(stripped) >= 2 and stripped[0] == '|' and stripped[-1] == '|'
 
-    # Add any remaining requests as final phase
-    if current_requests:
-        phases.append({"type": "requests", "requests": current_requests})
-
-    return phases
 
+def _is_table_separator(line: str) -> bool:
+    """Check whether a line is a table header separator like |---|:--:|."""
+    if len(line) < 3 or line[0] != '|' or line[-1] != '|':
+        return False
+    rest = line[1:-1].translate(_TABLE_SEP_DELETE)
+    return not rest or rest.isspace()
 
-def _parse_table_data(lines: List[str]) -> Tuple[List[str], List[List[str]]]:
-    """Parse table lines into headers and rows."""
-    # Parse header row
-    header_row = lines[0]
-    headers = [cell.strip() for cell in header_row.strip('|').split('|')]
 
-    # Skip separator row (|---|---|)
-    data_start = 1
-    if len(lines) > 1 and re.match(r'^\|[\s\-:|]+\|$', lines[1]):
-        data_start = 2
+def _split_table_row(line: str) -> List[str]:
+    """Split a table row into its stripped cell texts."""
+    return [cell.strip() for cell in line.strip('|').split('|')]
 
-    # Parse data rows
-    rows = []
-    for line in lines[data_start:]:
-        cells = [cell.strip() for cell in line.strip('|').split('|')]
-        rows.append(cells)
 
-    return headers, rows
+def _native_table_length(headers: List[str], rows: List[List[str]]) -> int:
+    """
+    Predict how far a native table advances the document index: the newline
+    insertTable adds before it, one index for the table, each row and each
+    cell, one per cell paragraph, plus the cell text.
+    """
+    num_cols = len(headers)
+    length = 2 + (1 + len(rows)) * (1 + num_cols * 2)
+    length += sum(len(text) for text in headers)
+    for row in rows:
+        length += sum(len(text) for text in row[:num_cols])
+    return length
 
 
 def parse_markdown(content: str) -> List[Dict[str, Any]]:
@@ -238,33 +219,52 @@ def parse_markdown(content: str) -> List[Dict[str, Any]]:
     - Horizontal rules (--- or ***)
     - Tables (| col | col |)
     """
+    phases = _parse_blocks(content, native_tables=False)
+    return phases[0]["requests"] if phases else []
+
+
+def _parse_blocks(content: str, native_tables: bool) -> List[Dict[str, Any]]:
+    """
+    Parse Markdown content into phases (the core of both public parsers).
+
+    With native_tables, each table closes the current requests phase and gets
+    a table phase of its own. Otherwise tables are rendered inline as
+    monospace text and everything ends up in a single requests phase.
+    """
+    phases = []
     requests = []
     current_index = 1  # Google Docs starts at index 1
 
     lines = content.split('\n')
+    num_lines = len(lines)
+    fence_indices = [k for k, ln in enumerate(lines) if ln.startswith('```')]
     i = 0
 
-    while i < len(lines):
+    # Bound once: these run several times per line
+    append_request = requests.append
+    extend_requests = requests.extend
+
+    while i < num_lines:
         line = lines[i]
+        stripped = line.strip()
 
         # Check for code blocks
         if line.startswith('```'):
-            code_lines = []
-            i += 1
-            while i < len(lines) and not lines[i].startswith('```'):
-                code_lines.append(lines[i])
-                i += 1
-            code_text = '\n'.join(code_lines) + '\n'
+            # Jump straight to the closing fence (or the end of the content)
+            next_fence = bisect_right(fence_indices, i)
+            close = fence_indices[next_fence] if next_fence < len(fence_indices) else num_lines
+            code_text = '\n'.join(lines[i + 1:close]) + '\n'
+            i = close
             if code_text.strip():
-                requests.append(_insert_text_request(current_index, code_text))
+                append_request(_insert_text_request(current_index, code_text))
                 end_index = current_index + len(code_text)
                 # Apply monospace font to text
-                requests.append(_update_text_style_request(
+                append_request(_update_text_style_request(
                     current_index, end_index,
                     font_family="Courier New"
                 ))
                 # Apply paragraph-level shading for full-width background
-                requests.append(_update_paragraph_style_request_code_block(
+                append_request(_update_paragraph_style_request_code_block(
                     current_index, end_index
                 ))
                 current_index = end_index
@@ -272,16 +272,16 @@ def parse_markdown(content: str) -> List[Dict[str, Any]]:
             continue
 
         # Check for horizontal rules
-        if re.match(r'^(-{3,}|\*{3,}|_{3,})$', line.strip()):
+        if _RE_HR.match(stripped):
             # Insert a horizontal line using repeated dashes with styling
             hr_text = "─" * 50 + '\n'
-            requests.append(_insert_text_request(current_index, hr_text))
+            append_request(_insert_text_request(current_index, hr_text))
             end_index = current_index + len(hr_text) - 1
-            requests.append(_update_text_style_request(
+            append_request(_update_text_style_request(
                 current_index, end_index,
-                foreground_color={"red": 0.7, "green": 0.7, "blue": 0.7}
+                foreground_color=_GREY_70
             ))
-            requests.append(_update_paragraph_style_request_alignment(
+            append_request(_update_paragraph_style_request_alignment(
                 current_index, end_index + 1, "CENTER"
             ))
             current_index += len(hr_text)
@@ -289,343 +289,239 @@ def parse_markdown(content: str) -> List[Dict[str, Any]]:
             continue
 
         # Check for tables (start of table)
-        if '|' in line and re.match(r'^\|.*\|$', line.strip()):
-            table_lines = [line]
+        if _is_table_row(stripped):
+            # Split each row into cells as it is read
+            headers = _split_table_row(line)
             i += 1
-            while i < len(lines) and '|' in lines[i] and re.match(r'^\|.*\|$', lines[i].strip()):
-                table_lines.append(lines[i])
+
+            # Skip separator row (|---|---|)
+            if i < num_lines and _is_table_separator(lines[i]):
                 i += 1
-            table_requests, new_index = _parse_table(table_lines, current_index)
-            requests.extend(table_requests)
-            current_index = new_index
+
+            rows = []
+            while i < num_lines and _is_table_row(lines[i].strip()):
+                rows.append(_split_table_row(lines[i]))
+                i += 1
+
+            if not native_tables:
+                table_requests, new_index = _parse_table(headers, rows, current_index)
+                extend_requests(table_requests)
+                current_index = new_index
+                continue
+
+            # Save current requests as a phase before the table
+            if requests:
+                phases.append({"type": "requests", "requests": requests})
+                requests = []
+                append_request = requests.append
+                extend_requests = requests.extend
+
+            table_length = _native_table_length(headers, rows)
+            phases.append({
+                "type": "table",
+                "headers": headers,
+                "rows": rows,
+                "index": current_index,
+                "length": table_length,
+            })
+            current_index += table_length
             continue
 
+        # Headings, blockquotes, task/bullet/numbered lists: one regex decides
+        block_match = _RE_BLOCK.match(line)
+        kind = block_match.lastgroup if block_match else None
+
         # Check for headings
-        heading_match = re.match(r'^(#{1,6})\s+(.+)$', line)
-        if heading_match:
-            level = len(heading_match.group(1))
-            heading_content = heading_match.group(2)
+        if kind == 'heading':
+            level = len(block_match.group('heading_level'))
+            heading_content = block_match.group('heading_text')
             text, style_requests = _parse_inline_formatting(heading_content + '\n', current_index)
-            requests.append(_insert_text_request(current_index, text))
+            append_request(_insert_text_request(current_index, text))
             end_index = current_index + len(text)
-            requests.append(_update_paragraph_style_request(
+            append_request(_update_paragraph_style_request(
                 current_index, end_index,
                 f"HEADING_{level}"
             ))
             # Apply inline styles with adjusted indices
-            for req in style_requests:
-                requests.append(req)
+            extend_requests(style_requests)
             current_index = end_index
             i += 1
             continue
 
         # Check for blockquotes
-        blockquote_match = re.match(r'^>\s*(.*)$', line)
-        if blockquote_match:
-            quote_text = blockquote_match.group(1)
+        if kind == 'blockquote':
+            quote_text = block_match.group('quote_text')
             text, style_requests = _parse_inline_formatting(quote_text + '\n', current_index)
-            requests.append(_insert_text_request(current_index, text))
+            append_request(_insert_text_request(current_index, text))
             end_index = current_index + len(text)
             # Style as blockquote with indentation and left border
-            requests.append(_update_paragraph_style_request_blockquote(
+            append_request(_update_paragraph_style_request_blockquote(
                 current_index, end_index
             ))
-            requests.append(_update_text_style_request(
+            append_request(_update_text_style_request(
                 current_index, end_index - 1,
                 italic=True,
-                foreground_color={"red": 0.4, "green": 0.4, "blue": 0.4}
+                foreground_color=_GREY_40
             ))
-            requests.extend(style_requests)
+            extend_requests(style_requests)
             current_index = end_index
             i += 1
             continue
 
         # Check for task lists
-        task_match = re.match(r'^[-\*]\s+\[([ xX])\]\s+(.+)$', line)
-        if task_match:
-            is_checked = task_match.group(1).lower() == 'x'
-            task_text = task_match.group(2)
+        if kind == 'task':
+            is_checked = block_match.group('task_state').lower() == 'x'
+            task_text = block_match.group('task_text')
             # Use checkbox characters
-            checkbox = "☑ " if is_checked else "☐ "
+            checkbox = _TASK_DONE if is_checked else _TASK_TODO
             full_text = checkbox + task_text + '\n'
             text, style_requests = _parse_inline_formatting(full_text, current_index)
-            requests.append(_insert_text_request(current_index, text))
+            append_request(_insert_text_request(current_index, text))
             end_index = current_index + len(text)
-            requests.append(_create_bullet_request(current_index, end_index))
+            append_request(_create_bullet_request(current_index, end_index))
             if is_checked:
                 # Strike through completed tasks
-                requests.append(_update_text_style_request(
+                append_request(_update_text_style_request(
                     current_index + 2, end_index - 1,
                     strikethrough=True,
-                    foreground_color={"red": 0.6, "green": 0.6, "blue": 0.6}
+                    foreground_color=_GREY_60
                 ))
-            requests.extend(style_requests)
+            extend_requests(style_requests)
             current_index = end_index
             i += 1
             continue
 
         # Check for bullet lists (must come after task lists)
-        bullet_match = re.match(r'^([\s]*)[-\*]\s+(.+)$', line)
-        if bullet_match:
-            indent_str = bullet_match.group(1)
-            nesting_level = len(indent_str) // 2
-            list_text = bullet_match.group(2)
+        if kind == 'bullet':
+            list_text = block_match.group('bullet_text')
             text, style_requests = _parse_inline_formatting(list_text + '\n', current_index)
-            requests.append(_insert_text_request(current_index, text))
+            append_request(_insert_text_request(current_index, text))
             end_index = current_index + len(text)
-            requests.append(_create_bullet_request(current_index, end_index, nesting_level))
-            requests.extend(style_requests)
+            append_request(_create_bullet_request(current_index, end_index))
+            extend_requests(style_requests)
             current_index = end_index
             i += 1
             continue
 
         # Check for numbered lists
-        numbered_match = re.match(r'^([\s]*)\d+\.\s+(.+)$', line)
-        if numbered_match:
-            indent_str = numbered_match.group(1)
-            nesting_level = len(indent_str) // 2
-            list_text = numbered_match.group(2)
+        if kind == 'numbered':
+            list_text = block_match.group('numbered_text')
             text, style_requests = _parse_inline_formatting(list_text + '\n', current_index)
-            requests.append(_insert_text_request(current_index, text))
+            append_request(_insert_text_request(current_index, text))
             end_index = current_index + len(text)
-            requests.append(_create_numbered_list_request(current_index, end_index, nesting_level))
-            requests.extend(style_requests)
+            append_request(_create_numbered_list_request(current_index, end_index))
+            extend_requests(style_requests)
             current_index = end_index
             i += 1
             continue
 
         # Regular paragraph with inline formatting
-        if line.strip():
+        if stripped:
             text, style_requests = _parse_inline_formatting(line + '\n', current_index)
-            requests.append(_insert_text_request(current_index, text))
-            requests.extend(style_requests)
+            append_request(_insert_text_request(current_index, text))
+            extend_requests(style_requests)
             current_index += len(text)
-        elif i < len(lines) - 1:  # Empty line (paragraph break)
-            requests.append(_insert_text_request(current_index, '\n'))
+        elif i < num_lines - 1:  # Empty line (paragraph break)
+            append_request(_insert_text_request(current_index, '\n'))
             current_index += 1
 
         i += 1
 
-    return requests
+    # Add any remaining requests as final phase
+    if requests:
+        phases.append({"type": "requests", "requests": requests})
+
+    return phases
 
 
 def _parse_inline_formatting(text: str, start_index: int) -> Tuple[str, List[Dict[str, Any]]]:
     """Parse inline formatting and return clean text with style requests."""
     style_requests = []
-    result_text = ""
+    parts = []
+    append_part = parts.append
+    append_style = style_requests.append
     current_pos = start_index
-    i = 0
-
-    while i < len(text):
-        # Check for links [text](url)
-        link_match = re.match(r'\[([^\]]+)\]\(([^)]+)\)', text[i:])
-        if link_match:
-            link_text = link_match.group(1)
-            link_url = link_match.group(2)
-            result_text += link_text
-            style_requests.append(_update_text_style_request(
-                current_pos, current_pos + len(link_text),
-                link_url=link_url
-            ))
-            current_pos += len(link_text)
-            i += len(link_match.group(0))
-            continue
-
-        # Check for strikethrough ~~text~~
-        strike_match = re.match(r'~~(.+?)~~', text[i:])
-        if strike_match:
-            strike_text = strike_match.group(1)
-            result_text += strike_text
-            style_requests.append(_update_text_style_request(
-                current_pos, current_pos + len(strike_text),
-                strikethrough=True
-            ))
-            current_pos += len(strike_text)
-            i += len(strike_match.group(0))
-            continue
-
-        # Check for highlight ==text==
-        highlight_match = re.match(r'==(.+?)==', text[i:])
-        if highlight_match:
-            highlight_text = highlight_match.group(1)
-            result_text += highlight_text
-            style_requests.append(_update_text_style_request(
-                current_pos, current_pos + len(highlight_text),
-                background_color={"red": 1.0, "green": 1.0, "blue": 0.0}  # Yellow
-            ))
-            current_pos += len(highlight_text)
-            i += len(highlight_match.group(0))
-            continue
-
-        # Check for underline ++text++
-        underline_match = re.match(r'\+\+(.+?)\+\+', text[i:])
-        if underline_match:
-            underline_text = underline_match.group(1)
-            result_text += underline_text
-            style_requests.append(_update_text_style_request(
-                current_pos, current_pos + len(underline_text),
-                underline=True
-            ))
-            current_pos += len(underline_text)
-            i += len(underline_match.group(0))
-            continue
-
-        # Check for superscript ^text^
-        super_match = re.match(r'\^([^\^]+)\^', text[i:])
-        if super_match:
-            super_text = super_match.group(1)
-            result_text += super_text
-            style_requests.append(_update_text_style_request(
-                current_pos, current_pos + len(super_text),
-                baseline_offset="SUPERSCRIPT"
-            ))
-            current_pos += len(super_text)
-            i += len(super_match.group(0))
-            continue
-
-        # Check for subscript ~text~ (single tilde, not ~~)
-        sub_match = re.match(r'(?<!~)~([^~]+)~(?!~)', text[i:])
-        if sub_match and not text[i:].startswith('~~'):
-            sub_text = sub_match.group(1)
-            result_text += sub_text
-            style_requests.append(_update_text_style_request(
-                current_pos, current_pos + len(sub_text),
-                baseline_offset="SUBSCRIPT"
-            ))
-            current_pos += len(sub_text)
-            i += len(sub_match.group(0))
-            continue
-
-        # Check for bold+italic ***text***
-        bold_italic_match = re.match(r'\*\*\*(.+?)\*\*\*', text[i:])
-        if bold_italic_match:
-            bi_text = bold_italic_match.group(1)
-            result_text += bi_text
-            style_requests.append(_update_text_style_request(
-                current_pos, current_pos + len(bi_text),
-                bold=True,
-                italic=True
-            ))
-            current_pos += len(bi_text)
-            i += len(bold_italic_match.group(0))
-            continue
-
-        # Check for bold **text** or __text__
-        bold_match = re.match(r'(\*\*|__)(.+?)\1', text[i:])
-        if bold_match:
-            bold_text = bold_match.group(2)
-            result_text += bold_text
-            style_requests.append(_update_text_style_request(
-                current_pos, current_pos + len(bold_text),
-                bold=True
-            ))
-            current_pos += len(bold_text)
-            i += len(bold_match.group(0))
-            continue
-
-        # Check for italic *text* or _text_ (but not ** or __)
-        if (text[i] == '*' or text[i] == '_') and not text[i:].startswith('**') and not text[i:].startswith('__'):
-            italic_match = re.match(r'(\*|_)([^\*_]+)\1', text[i:])
-            if italic_match:
-                italic_text = italic_match.group(2)
-                result_text += italic_text
-                style_requests.append(_update_text_style_request(
-                    current_pos, current_pos + len(italic_text),
-                    italic=True
-                ))
-                current_pos += len(italic_text)
-                i += len(italic_match.group(0))
-                continue
-
-        # Check for inline code `text`
-        code_match = re.match(r'`([^`]+)`', text[i:])
-        if code_match:
-            code_text = code_match.group(1)
-            result_text += code_text
-            style_requests.append(_update_text_style_request(
-                current_pos, current_pos + len(code_text),
-                font_family="Courier New",
-                background_color={"red": 0.95, "green": 0.95, "blue": 0.95}
+    last_end = 0
+
+    for match in _RE_INLINE.finditer(text):
+        # Plain text between the previous match and this one
+        start = match.start()
+        if start > last_end:
+            append_part(text[last_end:start])
+            current_pos += start - last_end
+        last_end = match.end()
+
+        kind = match.lastgroup
+        inner = match.group(kind + '_text')
+        end_pos = current_pos + len(inner)
+
+        if kind == 'link':
+            append_style(_update_text_style_request(
+                current_pos, end_pos,
+                link_url=match.group('link_url')
             ))
-            current_pos += len(code_text)
-            i += len(code_match.group(0))
-            continue
+        else:
+            append_style(_update_text_style_request(current_pos, end_pos, **_INLINE_STYLES[kind]))
 
-        # Regular character
-        result_text += text[i]
-        current_pos += 1
-        i += 1
+        append_part(inner)
+        current_pos = end_pos
 
-    return result_text, style_requests
+    append_part(text[last_end:])
+    return ''.join(parts), style_requests
 
 
-def _parse_table(lines: List[str], start_index: int) -> Tuple[List[Dict[str, Any]], int]:
+def _parse_table(
+    headers: List[str],
+    rows: List[List[str]],
+    start_index: int
+) -> Tuple[List[Dict[str, Any]], int]:
     """
-    Parse a Markdown table and return requests.
+    Build requests for a Markdown table's header and data rows.
 
-    Uses a clean text-based table with box-drawing characters and monospace font.
-    Native Google Docs tables require complex index management that breaks
-    when mixed with other content in the same batch update.
+    Renders the table as box-drawing text in a monospace font. This is the
+    parse_markdown (single request list) output; create_from_markdown uses
+    parse_markdown_phased and inserts native tables instead.
     """
     requests = []
-    current_index = start_index
-
-    # Parse header row
-    header_row = lines[0]
-    headers = [cell.strip() for cell in header_row.strip('|').split('|')]
     num_cols = len(headers)
 
-    # Skip separator row (|---|---|)
-    data_start = 1
-    if len(lines) > 1 and re.match(r'^\|[\s\-:|]+\|$', lines[1]):
-        data_start = 2
-
-    # Parse data rows
-    data_rows = []
-    for line in lines[data_start:]:
-        cells = [cell.strip() for cell in line.strip('|').split('|')]
-        # Ensure each row has the right number of columns
-        while len(cells) < num_cols:
-            cells.append("")
-        data_rows.append(cells[:num_cols])
-
-    # Calculate column widths (min 10 chars for readability)
-    col_widths = [max(10, len(h)) for h in headers]
-    for row in data_rows:
-        for i, cell in enumerate(row):
-            if i < len(col_widths):
-                col_widths[i] = max(col_widths[i], len(cell))
+    # Ensure each row has the right number of columns
+    data_rows = [(cells + [""] * (num_cols - len(cells)))[:num_cols] for cells in rows]
+
+    # Calculate column widths (min 10 chars for readability). Every data row
+    # has exactly num_cols cells, so zip(*data_rows) yields the columns.
+    columns = zip(*data_rows) if data_rows else [()] * num_cols
+    col_widths = [
+        max(10, len(header), max(map(len, column), default=0))
+        for header, column in zip(headers, columns)
+    ]
+
+    # Build table with box-drawing characters, inserted as a single string.
+    # All three borders share the same horizontal runs.
+    runs = ["─" * (w + 2) for w in col_widths]
 
-    # Build table with box-drawing characters
     # Top border: ┌───────────┬───────────┐
-    top_border = "┌" + "┬".join("─" * (w + 2) for w in col_widths) + "┐\n"
-    requests.append(_insert_text_request(current_index, top_border))
-    current_index += len(top_border)
+    top_border = "┌" + "┬".join(runs) + "┐\n"
+    parts = [top_border]
 
     # Header row: │ Header1   │ Header2   │
-    header_text = "│ " + " │ ".join(h.ljust(col_widths[i]) for i, h in enumerate(headers)) + " │\n"
-    header_start = current_index
-    requests.append(_insert_text_request(current_index, header_text))
-    current_index += len(header_text)
+    header_text = "│ " + " │ ".join(h.ljust(w) for h, w in zip(headers, col_widths)) + " │\n"
+    header_start = start_index + len(top_border)
+    parts.append(header_text)
 
     # Header separator: ├───────────┼───────────┤
-    header_sep = "├" + "┼".join("─" * (w + 2) for w in col_widths) + "┤\n"
-    requests.append(_insert_text_request(current_index, header_sep))
-    current_index += len(header_sep)
+    parts.append("├" + "┼".join(runs) + "┤\n")
 
     # Data rows: │ Data1     │ Data2     │
     for row in data_rows:
-        row_text = "│ " + " │ ".join(
-            (row[i] if i < len(row) else "").ljust(col_widths[i])
-            for i in range(len(col_widths))
-        ) + " │\n"
-        requests.append(_insert_text_request(current_index, row_text))
-        current_index += len(row_text)
+        parts.append("│ " + " │ ".join(cell.ljust(w) for cell, w in zip(row, col_widths)) + " │\n")
 
     # Bottom border: └───────────┴───────────┘
-    bottom_border = "└" + "┴".join("─" * (w + 2) for w in col_widths) + "┘\n"
-    requests.append(_insert_text_request(current_index, bottom_border))
-    current_index += len(bottom_border)
+    parts.append("└" + "┴".join(runs) + "┘\n")
+
+    table_text = ''.join(parts)
+    requests.append(_insert_text_request(start_index, table_text))
+    current_index = start_index + len(table_text)
 
     # Style the entire table with monospace font for alignment
     requests.append(_update_text_style_request(
@@ -653,68 +549,22 @@ def _insert_text_request(index: int, text: str) -> Dict[str, Any]:
     }
 
 
-def _update_text_style_request(
-    start_index: int,
-    end_index: int,
-    bold: bool = None,
-    italic: bool = None,
-    underline: bool = None,
-    strikethrough: bool = None,
-    font_family: str = None,
-    font_size: int = None,
-    link_url: str = None,
-    foreground_color: Dict[str, float] = None,
-    background_color: Dict[str, float] = None,
-    baseline_offset: str = None,
-    small_caps: bool = None
-) -> Dict[str, Any]:
-    """Create an updateTextStyle request with all formatting options."""
+def _update_text_style_request(start_index: int, end_index: int, **styles: Any) -> Dict[str, Any]:
+    """
+    Create an updateTextStyle request with all formatting options.
+
+    Keyword arguments are the keys of _TEXT_STYLE_FIELDS (bold, italic,
+    font_family, link_url, foreground_color, ...); None values are skipped.
+    """
     text_style = {}
     fields = []
 
-    if bold is not None:
-        text_style["bold"] = bold
-        fields.append("bold")
-
-    if italic is not None:
-        text_style["italic"] = italic
-        fields.append("italic")
-
-    if underline is not None:
-        text_style["underline"] = underline
-        fields.append("underline")
-
-    if strikethrough is not None:
-        text_style["strikethrough"] = strikethrough
-        fields.append("strikethrough")
-
-    if font_family is not None:
-        text_style["weightedFontFamily"] = {"fontFamily": font_family}
-        fields.append("weightedFontFamily")
-
-    if font_size is not None:
-        text_style["fontSize"] = {"magnitude": font_size, "unit": "PT"}
-        fields.append("fontSize")
-
-    if link_url is not None:
-        text_style["link"] = {"url": link_url}
-        fields.append("link")
-
-    if foreground_color is not None:
-        text_style["foregroundColor"] = {"color": {"rgbColor": foreground_color}}
-        fields.append("foregroundColor")
-
-    if background_color is not None:
-        text_style["backgroundColor"] = {"color": {"rgbColor": background_color}}
-        fields.append("backgroundColor")
-
-    if baseline_offset is not None:
-        text_style["baselineOffset"] = baseline_offset
-        fields.append("baselineOffset")
-
-    if small_caps is not None:
-        text_style["smallCaps"] = small_caps
-        fields.append("smallCaps")
+    for name, value in styles.items():
+        if value is None:
+            continue
+        field, wrap = _TEXT_STYLE_FIELDS[name]
+        text_style[field] = value if wrap is None else wrap(value)
+        fields.append(field)
 
     return {
         "updateTextStyle": {
@@ -779,17 +629,8 @@ def _update_paragraph_style_request_blockquote(
                 "startIndex": start_index,
                 "endIndex": end_index
             },
-            "paragraphStyle": {
-                "indentStart": {"magnitude": 36, "unit": "PT"},
-                "indentFirstLine": {"magnitude": 36, "unit": "PT"},
-                "borderLeft": {
-                    "color": {"color": {"rgbColor": {"red": 0.8, "green": 0.8, "blue": 0.8}}},
-                    "width": {"magnitude": 3, "unit": "PT"},
-                    "padding": {"magnitude": 12, "unit": "PT"},
-                    "dashStyle": "SOLID"
-                }
-            },
-            "fields": "indentStart,indentFirstLine,borderLeft"
+            "paragraphStyle": _BLOCKQUOTE_PARAGRAPH_STYLE,
+            "fields": _BLOCKQUOTE_PARAGRAPH_FIELDS
         }
     }
 
@@ -805,25 +646,13 @@ def _update_paragraph_style_request_code_block(
                 "startIndex": start_index,
                 "endIndex": end_index
             },
-            "paragraphStyle": {
-                "shading": {
-                    "backgroundColor": {
-                        "color": {
-                            "rgbColor": {"red": 0.95, "green": 0.95, "blue": 0.95}
-                        }
-                    }
-                },
-                "indentStart": {"magnitude": 18, "unit": "PT"},
-                "indentEnd": {"magnitude": 18, "unit": "PT"},
-                "spaceAbove": {"magnitude": 6, "unit": "PT"},
-                "spaceBelow": {"magnitude": 6, "unit": "PT"}
-            },
-            "fields": "shading,indentStart,indentEnd,spaceAbove,spaceBelow"
+            "paragraphStyle": _CODE_BLOCK_PARAGRAPH_STYLE,
+            "fields": _CODE_BLOCK_PARAGRAPH_FIELDS
         }
     }
 
 
-def _create_bullet_request(start_index: int, end_index: int, nesting_level: int = 0) -> Dict[str, Any]:
+def _create_bullet_request(start_index: int, end_index: int) -> Dict[str, Any]:
     """Create a bullet list request."""
     return {
         "createParagraphBullets": {
@@ -831,12 +660,12 @@ def _create_bullet_request(start_index: int, end_index: int, nesting_level: int
                 "startIndex": start_index,
                 "endIndex": end_index
             },
-            "bulletPreset": "BULLET_DISC_CIRCLE_SQUARE"
+            "bulletPreset": _BULLET_PRESET_DISC
         }
     }
 
 
-def _create_numbered_list_request(start_index: int, end_index: int, nesting_level: int = 0) -> Dict[str, Any]:
+def _create_numbered_list_request(start_index: int, end_index: int) -> Dict[str, Any]:
     """Create a numbered list request."""
     return {
         "createParagraphBullets": {
@@ -844,11 +673,22 @@ def _create_numbered_list_request(start_index: int, end_index: int, nesting_leve
                 "startIndex": start_index,
                 "endIndex": end_index
             },
-            "bulletPreset": "NUMBERED_DECIMAL_NESTED"
+            "bulletPreset": _BULLET_PRESET_NUMBERED
         }
     }
 
 
+def doc_to_text(doc: Dict[str, Any]) -> str:
+    """Extract plain text from a document structure."""
+    return "".join(
+        para_element["textRun"]["content"]
+        for element in doc.get("body", {}).get("content", ())
+        if "paragraph" in element
+        for para_element in element["paragraph"].get("elements", ())
+        if "textRun" in para_element and "content" in para_element["textRun"]
+    )
+
+
 def doc_to_markdown(doc: Dict[str, Any]) -> str:
     """
     Convert a Google Doc to Markdown format with full formatting.
@@ -863,10 +703,15 @@ def doc_to_markdown(doc: Dict[str, Any]) -> str:
     - Code formatting (monospace fonts)
     - Blockquotes (indented with border)
     """
-    lines = []
-    content = doc.get("body", {}).get("content", [])
+    out = StringIO()
+    content = doc.get("body", {}).get("content") or ()
     lists = doc.get("lists", {})
 
+    # Bound once: these run for every paragraph. Each line is written with
+    # its newline and the final one is dropped at the end.
+    write = out.write
+    lists_get = lists.get
+
     for element in content:
         if "paragraph" not in element:
             continue
@@ -877,126 +722,164 @@ def doc_to_markdown(doc: Dict[str, Any]) -> str:
         bullet = paragraph.get("bullet")
 
         # Check for blockquote (indented with left border)
-        is_blockquote = False
-        if style.get("borderLeft") and style.get("indentStart"):
-            is_blockquote = True
+        is_blockquote = bool(style.get("borderLeft") and style.get("indentStart"))
 
         # Build paragraph text with inline formatting
-        para_text = ""
-        for para_element in paragraph.get("elements", []):
+        texts = []
+        styles = []
+        for para_element in paragraph.get("elements") or ():
             if "textRun" not in para_element:
                 continue
 
             text_run = para_element["textRun"]
-            text = text_run.get("content", "")
-            text_style = text_run.get("textStyle", {})
-
-            # Skip if just a newline
-            if text == "\n":
+            # Strip trailing newline for processing; skip runs with no text
+            # left, which would otherwise format to bare markers like ****
+            text = text_run.get("content", "").rstrip("\n")
+            if not text:
                 continue
+            texts.append(text)
+            styles.append(text_run.get("textStyle", {}))
 
-            # Strip trailing newline for processing
-            text = text.rstrip("\n")
-
-            # Apply formatting in order of precedence
-            formatted_text = _format_text_run(text, text_style)
-            para_text += formatted_text
+        # Apply formatting in order of precedence. Paragraphs where no run
+        # carries any style (the common case) are joined as they are.
+        if any(styles):
+            para_text = "".join(map(_format_text_run, texts, styles))
+        else:
+            para_text = "".join(texts)
 
         if not para_text:
-            lines.append("")
+            write("\n")
             continue
 
         # Handle bullet/numbered lists
         if bullet:
-            current_list_id = bullet.get("listId")
             nesting_level = bullet.get("nestingLevel", 0)
-            indent = "  " * nesting_level
+            indent = "  " * nesting_level if nesting_level else ""
 
-            list_props = lists.get(current_list_id, {}).get("listProperties", {})
-            nesting_levels = list_props.get("nestingLevels", [{}])
+            # Check for task list (checkbox characters)
+            head = para_text[:2]
+            if head == _TASK_DONE:
+                write(f"{indent}- [x] {para_text[2:]}\n")
+                continue
+            if head == _TASK_TODO:
+                write(f"{indent}- [ ] {para_text[2:]}\n")
+                continue
 
-            if nesting_level < len(nesting_levels):
-                glyph_type = nesting_levels[nesting_level].get("glyphType", "")
-            else:
-                glyph_type = ""
+            # Only other list items need the list's glyph type
+            glyph_type = ""
+            list_info = lists_get(bullet.get("listId"))
+            if list_info:
+                nesting_levels = list_info.get("listProperties", {}).get("nestingLevels")
+                if nesting_levels and nesting_level < len(nesting_levels):
+                    glyph_type = nesting_levels[nesting_level].get("glyphType", "")
 
-            # Check for task list (checkbox characters)
-            if para_text.startswith("☑ "):
-                lines.append(f"{indent}- [x] {para_text[2:]}")
-            elif para_text.startswith("☐ "):
-                lines.append(f"{indent}- [ ] {para_text[2:]}")
-            elif glyph_type in ["DECIMAL", "ALPHA", "ROMAN"]:
-                lines.append(f"{indent}1. {para_text}")
+            if glyph_type in _NUMBERED_GLYPHS:
+                write(f"{indent}1. {para_text}\n")
             else:
-                lines.append(f"{indent}- {para_text}")
+                write(f"{indent}- {para_text}\n")
             continue
 
         # Handle blockquotes
         if is_blockquote:
-            lines.append(f"> {para_text}")
+            write(f"> {para_text}\n")
             continue
 
         # Handle headings
-        if named_style.startswith("HEADING_"):
-            level = int(named_style.split("_")[1])
-            prefix = "#" * level
-            lines.append(f"{prefix} {para_text}")
+        prefix = HEADING_PREFIX.get(named_style)
+        if prefix is not None:
+            write(prefix + para_text + "\n")
             continue
 
         # Check for horizontal rule (line of dashes)
-        if para_text.strip() and all(c in "─-—" for c in para_text.strip()):
-            lines.append("---")
+        stripped = para_text.strip()
+        if stripped and not stripped.strip(_HR_CHARS):
+            write("---\n")
             continue
 
         # Regular paragraph
-        lines.append(para_text)
+        write(para_text + "\n")
 
-    return "\n".join(lines)
+    return out.getvalue()[:-1]
 
 
 def _format_text_run(text: str, text_style: Dict[str, Any]) -> str:
     """Format a text run based on its style."""
+    # Unstyled runs are common even in paragraphs that have some formatting
+    if not text_style:
+        return text
+
     # Check for link first (exclusive)
     if "link" in text_style:
         url = text_style["link"].get("url", "")
         return f"[{text}]({url})"
 
-    # Check for code (monospace font)
-    font_family = text_style.get("weightedFontFamily", {}).get("fontFamily", "")
-    is_code = "courier" in font_family.lower() or "mono" in font_family.lower()
+    style_get = text_style.get
 
-    if is_code:
-        return f"`{text}`"
+    # Check for code (monospace font)
+    weighted_font = style_get("weightedFontFamily")
+    if weighted_font:
+        font_family = weighted_font.get("fontFamily", "")
+        if font_family in _MONO_EXACT or _MONO_RE.search(font_family):
+            return f"`{text}`"
 
     # Check for baseline offset (superscript/subscript)
-    baseline = text_style.get("baselineOffset", "NONE")
+    baseline = style_get("baselineOffset")
     if baseline == "SUPERSCRIPT":
         return f"^{text}^"
     elif baseline == "SUBSCRIPT":
         return f"~{text}~"
 
     # Check for highlight (yellow background)
-    bg_color = text_style.get("backgroundColor", {}).get("color", {}).get("rgbColor", {})
-    if bg_color.get("red", 0) > 0.9 and bg_color.get("green", 0) > 0.9 and bg_color.get("blue", 0) < 0.2:
-        text = f"=={text}=="
-
-    # Apply text decorations
-    is_bold = text_style.get("bold", False)
-    is_italic = text_style.get("italic", False)
-    is_underline = text_style.get("underline", False)
-    is_strikethrough = text_style.get("strikethrough", False)
-
-    if is_strikethrough:
-        text = f"~~{text}~~"
-
-    if is_underline:
-        text = f"++{text}++"
-
-    if is_bold and is_italic:
-        text = f"***{text}***"
-    elif is_bold:
-        text = f"**{text}**"
-    elif is_italic:
-        text = f"*{text}*"
-
-    return text
+    is_highlight = False
+    background = style_get("backgroundColor")
+    if background:
+        bg_color = background.get("color", {}).get("rgbColor")
+        if bg_color and bg_color.get("red", 0) > 0.9 and bg_color.get("green", 0) > 0.9 and bg_color.get("blue", 0) < 0.2:
+            is_highlight = True
+
+    opening, closing = _run_markers(
+        bool(style_get("bold")),
+        bool(style_get("italic")),
+        bool(style_get("underline")),
+        bool(style_get("strikethrough")),
+        is_highlight,
+    )
+    if not opening:
+        return text
+    return opening + text + closing
+
+
+@lru_cache(maxsize=None)
+def _run_markers(
+    bold: bool,
+    italic: bool,
+    underline: bool,
+    strikethrough: bool,
+    highlight: bool
+) -> Tuple[str, str]:
+    """
+    Return the opening and closing Markdown markers for a set of text decorations.
+
+    Markers go from outermost (bold/italic) to innermost (highlight). Every
+    marker is symmetric, so the closing side is the opening reversed. There
+    are only 32 combinations, so the cache stays tiny.
+    """
+    if bold and italic:
+        opening = "***"
+    elif bold:
+        opening = "**"
+    elif italic:
+        opening = "*"
+    else:
+        opening = ""
+
+    if underline:
+        opening += "++"
+
+    if strikethrough:
+        opening += "~~"
+
+    if highlight:
+        opening += "=="
+
+    return opening, opening[::-1]